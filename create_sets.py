@@ -91,7 +91,8 @@ Inputs:
             A value indicating the predictive power ranking of that column.
             The columns should appear in descending order by this ranking.
             The column with the highest ranking should appear first, etc.
-            However, this is not checked by this script.
+            This is checked by this script, for the lines of the file it
+            reads.
 
 Outputs:
    An output file for each training set.
@@ -107,10 +108,35 @@ import argparse
 import os
 import pickle
 import random
+import bisect
+from array import array
+import io
+import itertools
+import operator
+from collections import defaultdict
 from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 import zipfile
 import time
 
+try:
+    # Only available on Unix systems.
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    # Only available from Python 3.8.
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+# The number of bytes of the original file read at a time. This is both the
+# buffer size of the original file object and about how many bytes of lines
+# process_original_file takes from it at once. The original file is read in
+# binary, so no decoding is done on any of it.
+READ_BUFFER_SIZE = 1 << 20
+
 class SelectionSet:
 
     """
@@ -119,8 +145,10 @@ class SelectionSet:
 
     Each subclass should have the following members:
 
-        row_ordinals: A Python set object that has the row ordinals of the rows
-                      (lines) of the original file to be written for this set.
+        row_ordinals: A Python array object, of 8 byte integers, that has the
+                      row ordinals of the rows (lines) of the original file to
+                      be written for this set, in ascending order. This takes
+                      much less memory than a set of Python integers.
 
         column_ordinals: A list of the randomly selected columns to write from
                          a line of the original file. It does not include the
@@ -135,17 +163,62 @@ class SelectionSet:
                         appended to output_columns, so they are in the same
                         order as in the original file.
 
-        set_file: An open file object to write the selected data to.
+        column_getter: An operator.itemgetter that gets the fields of the
+                       output columns, except a row ordinal placeholder, from
+                       the fields of a line of the original file.
+
+        prepend_ordinal: True if the row ordinal is written as the first
+                         column, instead of a case number column.
+
+        last_column_index: The index of the last field of a line of the
+                           original file that is written for this set.
+
+        writes_whole_line: True if the output columns, other than a row
+                           ordinal placeholder, are all the columns of the
+                           original file, in order. The line is then written
+                           as is, without splitting it into fields.
+
+        write_line: A function that writes the output columns of a line of
+                    the original file, to write_buffer. Made by
+                    make_line_writer once the output columns are defined.
+
+        file_name: The name of the file to write the selected data to.
+
+        set_file: An open, unbuffered, binary file object to write the
+                  selected data to.
+
+        write_buffer: A bytearray of the lines waiting to be written to
+                      set_file.
 
     """
 
+    # pylint: disable=too-many-instance-attributes
+
+    # The number of bytes collected in write_buffer before they are written
+    # to set_file. There can be as many set files open at once as the system
+    # limit on open files allows, so the default is kept modest. Set from
+    # args.write_buffer_size.
+    write_buffer_size = 1 << 16
+
+    # If not None, a dictionary that write_ordinals adds ordinals to, keyed by
+    # the ordinal file name, instead of writing each to its own file. This is
+    # for writing the ordinals for all sets to a single file.
+    ordinals_collection = None
+
     def __init__(self):
-        self.row_ordinals = set()
+        self.row_ordinals = array('q')
         self.column_ordinals = None
         self.output_columns = None
+        self.column_getter = None
+        self.prepend_ordinal = False
+        self.last_column_index = None
+        self.writes_whole_line = False
+        self.write_line = None
+        self.file_name = None
         self.set_file = None
+        self.write_buffer = bytearray()
 
-    def define_output_columns(self, args):
+    def define_output_columns(self, args, original_column_count):
 
         """
         For writing the selected columns in the same order as they are in the
@@ -172,29 +245,86 @@ class SelectionSet:
 
         self.output_columns += column_ordinals_sorted
 
-    def get_random_ordinals(self, ordinals, count):
+        # Computed once here rather than for every line written. A first
+        # output column of None indicates writing the row ordinal instead.
+        self.prepend_ordinal = self.output_columns[0] is None
+
+        # Because we count column ordinals from 1, but list indices start at 0.
+        indices = [o - 1 for o in self.output_columns if o is not None]
+
+        if len(indices) == 1:
+            # itemgetter returns a single item, not a tuple, for one index.
+            # A slice gets a one item list instead.
+            self.column_getter = operator.itemgetter(
+                                     slice(indices[0], indices[0] + 1))
+        else:
+            self.column_getter = operator.itemgetter(*indices)
+
+        self.last_column_index = max(indices)
+
+        # Ex. all the columns of a generic set with no case or outcome column,
+        # or case column 1, outcome column 2 and the rest of the columns. The
+        # set files are always comma separated, so the line can only be
+        # written as is if the original file is too.
+        self.writes_whole_line = (args.delimiter == ',' and
+                                  indices == list(range(original_column_count)))
+
+        self.write_line = self.make_line_writer()
+
+    def get_set_rng(self, args, set_name):
 
         """
-        Get a set of count random elements from ordinals.
+        Get the random.Random object to choose the rows and columns of this
+        set with, seeded from args.seed and set_name, the name of the set,
+        ex. "training-set-3".
+
+        Each set has its own random number generator, so what it chooses
+        doesn't depend on the sets created before it. A set created again on
+        a later pass, after running out of open files, or created in a --jobs
+        worker process, makes the same choices.
+        """
+
+        return random.Random(f'{args.seed}-{set_name}')
 
-        ordinals are a list of data line ordinals from the original file.
+    def get_random_ordinals(self, ordinals, count, rng):
+
+        """
+        Get an array of count random elements from ordinals, sorted in
+        ascending order.
+
+        ordinals are a sequence of data line ordinals from the original file,
+        an array, or for generic sets a range.
 
         count should be an integer.
+
+        rng is the random.Random object to sample with.
+
+        Indices into ordinals are sampled, and mapped back to ordinals,
+        since before Python 3.10 rng.sample doesn't accept an array. This
+        makes the same draws as sampling ordinals. rng.sample makes a list of
+        every index when there are not many more ordinals than count: in
+        CPython, when there are at most 21 + 4**ceil(log4(3*count)) of them.
+        Otherwise the cost depends on count only.
         """
 
-        ordinal_sample = set(random.sample(ordinals, count))
+        indices = rng.sample(range(len(ordinals)), count)
+        ordinal_sample = array('q', sorted([ordinals[i] for i in indices]))
         return ordinal_sample
 
-    def get_random_ordinals_exclude(self, count, start, end, exclude):
+    def get_random_ordinals_exclude(self, count, start, end, exclude, rng):
 
         """
         Get a set of count random integers between start and end, inclusive,
         but not including any integers in the exclude.
 
-        This is without replacement, so a random integer should also not
-        already be in the result set. This is enforced by the set data type
-        which does not have duplciates. The set add function doesn't change
-        the set if it already has the element being added.
+        This is without replacement, using Robert Floyd's sampling algorithm.
+        It makes exactly count random draws, with no retries, no matter how
+        close count is to the number of integers available.
+
+        The draws are made from a range reduced by the number of excluded
+        integers within start and end. Each drawn integer is then shifted up
+        past the excluded integers less than or equal to it, so none of the
+        excluded integers are returned.
 
         count, start and end should be integers.
 
@@ -202,14 +332,48 @@ class SelectionSet:
 
         count should be < (end - start + 1)
 
-        exclude should be a set of integers. It may be empty.
+        exclude should be a set of integers. It may be empty. It may also
+        contain None, for a case or outcome column that was not specified.
 
+        rng is the random.Random object to draw with.
         """
+
+        # pylint: disable=too-many-locals
+
+        excluded = sorted(e for e in exclude
+                          if e is not None and start <= e <= end)
+
+        # Excluded integer i, in ascending order, less the number of excluded
+        # integers before it. The number of these <= a drawn integer is how
+        # far that integer must be shifted to skip the excluded integers.
+        shifts = [e - i for (i, e) in enumerate(excluded)]
+
+        # Floyd's algorithm, over offsets from start in the reduced range.
+        available_count = end - start + 1 - len(excluded)
+        randrange = rng.randrange
+        if available_count <= 32 * count:
+            # A dense sample, such as most of the columns. Mark the chosen
+            # offsets in a bytearray, one byte per offset, which is then
+            # smaller than a set of the chosen offsets.
+            chosen = bytearray(available_count)
+            for j in range(available_count - count, available_count):
+                t = randrange(j + 1)
+                if chosen[t]:
+                    t = j
+                chosen[t] = 1
+            offsets = itertools.compress(range(available_count), chosen)
+        else:
+            offsets = set()
+            for j in range(available_count - count, available_count):
+                t = randrange(j + 1)
+                if t in offsets:
+                    t = j
+                offsets.add(t)
+
         ordinals = set()
-        while len(ordinals) < count:
-            r = random.randint(start, end)
-            if not r in exclude:
-                ordinals.add(r)
+        for t in offsets:
+            r = start + t
+            ordinals.add(r + bisect.bisect_right(shifts, r))
 
         return ordinals
 
@@ -220,18 +384,55 @@ class SelectionSet:
 
         These are typically needed by subsequent machine learning steps, not part
         of the data set selection process.
+
+        If ordinals_collection is being used, the sorted ordinals are added to
+        it with file_name as the key instead, as an array of 8 byte integers.
         """
 
-        sorted_ordinals = sorted(ordinals)
+        if isinstance(ordinals, array):
+            # Row ordinals, which are already an array in ascending order.
+            sorted_ordinals = ordinals
+        else:
+            # Column ordinals.
+            sorted_ordinals = array('q', sorted(ordinals))
+
+        if SelectionSet.ordinals_collection is not None:
+            SelectionSet.ordinals_collection[file_name] = sorted_ordinals
+            return
+
         with open(file_name, 'w', encoding='utf_8') as ordinal_file:
-            for o in sorted_ordinals:
-                ordinal_file.write(str(o) + '\n')
+            ordinal_file.write(''.join(f'{o}\n' for o in sorted_ordinals))
 
-    def check_line(self, ordinal, fields):
+    def remove_ordinals(self, file_name):
 
         """
-        Check a line from the original file, to see if fields from it should be
-        written for this training set.
+        Remove the ordinals written by write_ordinals for file_name, if they
+        were written, from the file or from ordinals_collection.
+        """
+
+        if file_name is None:
+            return
+
+        if SelectionSet.ordinals_collection is not None:
+            SelectionSet.ordinals_collection.pop(file_name, None)
+        elif os.access(file_name, os.R_OK):
+            os.remove(file_name)
+
+    def make_line_writer(self):
+
+        """
+        Make the function that writes the output columns of a line from the
+        original file that is for this selection set, as write_line.
+
+        The function takes the line ordinal, the line without its line ending,
+        and a list of the bytes objects of the fields of the line. The caller
+        has already determined that the ordinal is one of this set's row
+        ordinals. If writes_whole_line is True the line itself is written, and
+        the fields are not used. They are None if no selection set needs them.
+
+        It is called for every line written, so everything it uses is bound
+        to a local variable here, once, rather than looked up as an attribute
+        of this object for every line.
 
         output_columns is sorted in ascending order by column ordinal, so the
         columns will be written in the same order they are in the original
@@ -239,28 +440,89 @@ class SelectionSet:
         present are always the first two columns.
         """
 
-        if ordinal in self.row_ordinals:
-            # This line is for this selection set.
+        column_getter = self.column_getter
+        write_buffer = self.write_buffer
+        extend = write_buffer.extend
+        write_buffer_size = SelectionSet.write_buffer_size
+        flush = self.flush
+
+        # bytes.join is used rather than a preformatted '%s,%s,...' string,
+        # since it is about twice as fast for the number of columns typical
+        # of a set.
+        #
+        # Nor is the writer generated as source with the field indices
+        # written out, since the itemgetter already applies fixed indices in C.
+        join = b','.join
+
+        # pylint: disable=unused-argument
+        if self.writes_whole_line:
+            if self.prepend_ordinal:
+                def write_line(ordinal, line, fields):
+                    extend(b'%d,%s\n' % (ordinal, line))
+                    if len(write_buffer) >= write_buffer_size:
+                        flush()
+            else:
+                def write_line(ordinal, line, fields):
+                    extend(line)
+                    extend(b'\n')
+                    if len(write_buffer) >= write_buffer_size:
+                        flush()
+        elif self.prepend_ordinal:
+            # This is for a generic set that is not including the case
+            # column. Write the row ordinal instead.
+            def write_line(ordinal, line, fields):
+                extend(b'%d,%s\n' % (ordinal, join(column_getter(fields))))
+                if len(write_buffer) >= write_buffer_size:
+                    flush()
+        else:
+            def write_line(ordinal, line, fields):
+                extend(join(column_getter(fields)) + b'\n')
+                if len(write_buffer) >= write_buffer_size:
+                    flush()
 
-            fields_to_write = []
-            for i, o in enumerate(self.output_columns):
+        return write_line
 
-                if i == 0 and self.output_columns[i] is None:
-                    # This is for a generic set that is not including the case
-                    # column. Write the row ordinal instead.
-                    fields_to_write.append(str(ordinal))
-                else:
-                    # Write a data column.
-                    # Because we count column ordinals from 1, but list indices
-                    # start at 0.
-                    o1 = o - 1
-                    fields_to_write.append(fields[o1])
+    def flush(self):
+
+        """
+        Write any lines collected in write_buffer to set_file.
+
+        set_file is unbuffered, so a write may write only part of what it is
+        given. Write until it has all been written.
+        """
+
+        if self.write_buffer:
+            with memoryview(self.write_buffer) as view:
+                written = 0
+                while written < len(view):
+                    written += self.set_file.write(view[written:])
 
-            # Write the fields to the training set file.
-            field_str = ','.join(fields_to_write) + '\n'
-            self.set_file.write(field_str)
+            self.write_buffer.clear()
+
+    def open_set_file(self):
+
+        """
+        Open set_file for writing.
+
+        It is opened in binary, since the fields written are bytes objects
+        read from the original file. It is also unbuffered, since lines are
+        collected in write_buffer and written in large blocks. A buffered
+        file object would only add a copy, and lock and release a lock for
+        every write.
+        """
+
+        # pylint: disable=consider-using-with
+        self.set_file = open(self.file_name, 'wb', buffering=0)
+
+    def get_selection_sets(self):
+
+        """
+        Get a list of this selection set and any selection sets it owns, each
+        of which writes its own set file.
+        """
+
+        return [self]
 
-# pylint: disable=too-many-instance-attributes
 class ValidationSet(SelectionSet):
 
     """
@@ -272,8 +534,11 @@ class ValidationSet(SelectionSet):
     validation set.
     """
 
+    # pylint: disable=too-many-instance-attributes
+
     # The subset of row ordinals from the original data file to use for
-    # sampling when creating a validation set.
+    # sampling when creating a validation set. An array of 8 byte integers,
+    # or a range for generic sets.
     available_ordinals = None
 
     # pylint: disable=too-many-arguments
@@ -297,9 +562,11 @@ class ValidationSet(SelectionSet):
         # This is the same ordinal as the associated training set.
         self.file_ordinal = file_ordinal
 
+        rng = self.get_set_rng(args, f'{prefix}{file_ordinal}')
+
         self.row_ordinals = self.get_random_ordinals(
                                      ValidationSet.available_ordinals,
-                                     row_count)
+                                     row_count, rng)
 
         # Determine the columns to use for this validation set. If a column set
         # was provided, use it. Otherwise use a random set of columns.
@@ -307,13 +574,14 @@ class ValidationSet(SelectionSet):
         self.output_columns = None
         if column_set is not None:
             self.column_ordinals = column_set
-            self.define_output_columns(args)
+            self.define_output_columns(args, original_column_count)
         else:
             exclude_cols = set([args.case_column, args.outcome_column])
             self.column_ordinals = self.get_random_ordinals_exclude(
                                           args.column_count, 1,
-                                          original_column_count, exclude_cols)
-            self.define_output_columns(args)
+                                          original_column_count, exclude_cols,
+                                          rng)
+            self.define_output_columns(args, original_column_count)
 
         self.file_name = f'{prefix}{self.file_ordinal}.csv'
 
@@ -336,9 +604,8 @@ class ValidationSet(SelectionSet):
                 self.cleanup()
                 raise e
 
-        # pylint: disable=consider-using-with
         try:
-            self.set_file = open(self.file_name, 'w', encoding='utf_8')
+            self.open_set_file()
         except OSError as e:
             self.cleanup()
             raise e
@@ -354,13 +621,8 @@ class ValidationSet(SelectionSet):
         open files.
         """
 
-        if (self.row_ordinal_file_name is not None and
-                os.access(self.row_ordinal_file_name, os.R_OK)):
-            os.remove(self.row_ordinal_file_name)
-
-        if (self.column_ordinal_file_name is not None and
-                os.access(self.column_ordinal_file_name, os.R_OK)):
-            os.remove(self.column_ordinal_file_name)
+        self.remove_ordinals(self.row_ordinal_file_name)
+        self.remove_ordinals(self.column_ordinal_file_name)
 
         if self.set_file is not None:
             if not self.set_file.closed:
@@ -374,9 +636,9 @@ class ValidationSet(SelectionSet):
         Close the selection set file.
         To be called once the selection set has been fully processed.
         """
+        self.flush()
         self.set_file.close()
 
-# pylint: disable=too-many-instance-attributes
 class TrainingSet(SelectionSet):
 
     """
@@ -399,7 +661,7 @@ class TrainingSet(SelectionSet):
     """
 
     # The subset of row ordinals from the original data file to use for
-    # sampling when creating a training set.
+    # sampling when creating a training set. An array of 8 byte integers.
     available_ordinals = None
 
     def __init__(self, file_ordinal, original_column_count, args, column_set):
@@ -427,11 +689,12 @@ class TrainingSet(SelectionSet):
         # The training set uses the same columns as the validation set.
         self.column_ordinals = self.validation_set.column_ordinals
 
+        rng = self.get_set_rng(args, f'training-set-{file_ordinal}')
         self.row_ordinals = self.get_random_ordinals(
                                      TrainingSet.available_ordinals,
-                                     args.training_row_count)
+                                     args.training_row_count, rng)
 
-        self.define_output_columns(args)
+        self.define_output_columns(args, original_column_count)
 
         self.file_name = f'training-set-{file_ordinal}.csv'
 
@@ -444,9 +707,8 @@ class TrainingSet(SelectionSet):
             self.cleanup()
             raise e
 
-        # pylint: disable=consider-using-with
         try:
-            self.set_file = open(self.file_name, 'w', encoding='utf_8')
+            self.open_set_file()
         except OSError as e:
             self.cleanup()
             raise e
@@ -461,9 +723,7 @@ class TrainingSet(SelectionSet):
         a file open failure because of too many open files.
         """
 
-        if (self.row_ordinal_file_name is not None and
-                os.access(self.row_ordinal_file_name, os.R_OK)):
-            os.remove(self.row_ordinal_file_name)
+        self.remove_ordinals(self.row_ordinal_file_name)
 
         if self.set_file is not None:
             if not self.set_file.closed:
@@ -474,19 +734,13 @@ class TrainingSet(SelectionSet):
 
         self.validation_set.cleanup()
 
-    def check_line(self, ordinal, fields):
+    def get_selection_sets(self):
 
         """
-        If doing a validation set for each training set, then check this
-        training set's validation set if it should write the line.
-
-        In either case check this training set if it should write the line.
+        Get a list of this TrainingSet and its ValidationSet.
         """
 
-        if self.validation_set is not None:
-            self.validation_set.check_line(ordinal, fields)
-
-        super().check_line(ordinal, fields)
+        return [self.validation_set, self]
 
     def close(self):
         """
@@ -495,6 +749,7 @@ class TrainingSet(SelectionSet):
 
         To be called once the selection set has been fully processed.
         """
+        self.flush()
         self.set_file.close()
         self.validation_set.close()
 
@@ -504,6 +759,8 @@ def define_and_get_args(args=None):
     Define and get the command line options.
     """
 
+    # pylint: disable=too-many-statements
+
     parser = argparse.ArgumentParser()
 
     msg = 'The file name of the original data set'
@@ -567,6 +824,33 @@ def define_and_get_args(args=None):
     parser.add_argument('--del', '--delimiter', dest='delimiter', help=msg,
                         type=str, default=',', required=False)
 
+    msg = 'The file name of a Pickle file to write the row and column'
+    msg += ' ordinals for all sets to, instead of writing separate ordinal'
+    msg += ' files for each set.'
+    parser.add_argument('--of', '--ordinals-file', dest='ordinals_file_name',
+                        help=msg, type=str, required=False)
+
+    msg = 'The number of processes to create the sets with. Each process'
+    msg += ' creates a range of the sets and makes its own passes of the'
+    msg += ' original file.'
+    parser.add_argument('-j', '--jobs', dest='jobs', help=msg, type=int,
+                        default=1, required=False)
+
+    msg = 'The seed for the random number generators. Running again with the'
+    msg += ' same seed, and the same original file and options, selects the'
+    msg += ' same rows and columns for each set. If not specified, a seed is'
+    msg += ' chosen and printed.'
+    parser.add_argument('--seed', dest='seed', help=msg, type=int,
+                        required=False)
+
+    msg = 'The size in KiB of the buffer for each set file. Lines for a set'
+    msg += ' are collected in its buffer, and written to the set file when'
+    msg += ' the buffer is full. There is one buffer for each set file open'
+    msg += ' at once.'
+    parser.add_argument('--wbs', '--write-buffer-size',
+                        dest='write_buffer_size', help=msg, type=int,
+                        default=64, required=False)
+
     args = parser.parse_args()
     return args
 
@@ -779,6 +1063,18 @@ def check_args(args):
         print(msg)
         args_ok = False
 
+    if args.jobs < 1:
+        msg = 'The job count, {0}, is less than 1.'
+        msg = msg.format(args.jobs)
+        print(msg)
+        args_ok = False
+
+    if args.write_buffer_size < 1:
+        msg = 'The write buffer size, {0}, is less than 1.'
+        msg = msg.format(args.write_buffer_size)
+        print(msg)
+        args_ok = False
+
     if args.generic_row_count is not None:
         args_ok = check_generic_args(args, args_ok)
     else:
@@ -856,6 +1152,10 @@ def print_args(args):
     print(f'args.case_column: {args.case_column}')
     print(f'args.outcome_column: {args.outcome_column}')
     print(f'args.delimiter: {args.delimiter}')
+    print(f'args.ordinals_file_name: {args.ordinals_file_name}')
+    print(f'args.jobs: {args.jobs}')
+    print(f'args.seed: {args.seed}')
+    print(f'args.write_buffer_size: {args.write_buffer_size}')
 
     print('')
 
@@ -889,7 +1189,6 @@ def check_args_additional(original_column_count, args):
     if not args_ok:
         sys.exit(1)
 
-# pylint:disable=too-many-statements
 def get_column_set(original_column_count, args):
 
     """
@@ -902,19 +1201,25 @@ def get_column_set(original_column_count, args):
         A value indicating the predictive power ranking of that column.
         The columns should appear in descending order by this ranking.
         The column with the highest ranking should appear first, etc.
-        However, this is not checked by this script.
 
     Only the requested number of columns to use (args.column_count) are read.
+    Each line is checked as it is read, and the order of the rankings is
+    checked once all the lines have been read.
     """
 
+    # pylint: disable=too-many-locals,too-many-statements
+
     column_set = []
-    previous_priority = float('inf')
+    # The same columns as column_set, for checking for duplicates without a
+    # search of the list.
+    column_set_seen = set()
+    priorities = []
     with open(args.column_set_file_name, 'r', encoding='utf_8') as input_file:
+        # Only the first args.column_count lines are read. islice stops
+        # reading after them, without a check of each line's ordinal.
+        lines = itertools.islice(input_file, args.column_count)
         ordinal_base = 1
-        for (ordinal, line) in enumerate(input_file, ordinal_base):
-
-            if ordinal > args.column_count:
-                break
+        for (ordinal, line) in enumerate(lines, ordinal_base):
 
             # Delete trailing newline so it isn't treated as part of the values
             # read.
@@ -968,15 +1273,7 @@ def get_column_set(original_column_count, args):
                 print(msg)
                 sys.exit(1)
 
-            if priority > previous_priority:
-                msg = 'Priority {} from line {} of column set file {}'
-                msg += ' is > the priority of {} from the previous line.'
-                msg = msg.format(priority, ordinal, args.column_set_file_name,
-                                 previous_priority)
-                print(msg)
-                sys.exit(1)
-
-            if column in column_set:
+            if column in column_set_seen:
                 msg = 'Column "{0}" from line {1}'
                 msg += ' already appeared in file {2}.'
                 msg = msg.format(fields[0], ordinal, args.column_set_file_name)
@@ -984,11 +1281,25 @@ def get_column_set(original_column_count, args):
                 sys.exit(1)
 
             column_set.append(column)
-            previous_priority = priority
+            column_set_seen.add(column)
+            priorities.append(priority)
+
+    # Whether each priority is greater than the one before it, which should
+    # all be False, computed in one pass rather than a comparison per line.
+    priority_increases = list(map(operator.gt, priorities[1:], priorities))
+    if any(priority_increases):
+        i = priority_increases.index(True) + 1
+        msg = 'Priority {} from line {} of column set file {}'
+        msg += ' is > the priority of {} from the previous line.'
+        # Line ordinals start at 1.
+        msg = msg.format(priorities[i], i + 1, args.column_set_file_name,
+                         priorities[i - 1])
+        print(msg)
+        sys.exit(1)
 
     return column_set
 
-def define_available_ordinals(original_line_count, args):
+def define_available_ordinals(original_line_count, args, rng):
 
     """
     Define two disjoint sets of line ordinals from the original file to be
@@ -997,14 +1308,21 @@ def define_available_ordinals(original_line_count, args):
     The ordinals for the data lines are shuffled, the first training_percent
     are chosen for sampling to create the training sets, and the remaining
     data ordinals used for sampling to create the validation sets.
+
+    rng is the random.Random object to shuffle with.
     """
 
     # 2 to skip the header line.
-    data_ordinals = list(range(2, original_line_count+1))
+    data_ordinals = range(2, original_line_count+1)
 
     if args.training_percent is not None:
         # Creating training and validation sets.
-        random.shuffle(data_ordinals)
+        # Kept as an array of 8 byte integers, rather than a list of Python
+        # integers, since it is kept for all passes of the original file. It
+        # is also much smaller to pass to any worker processes. It is
+        # shuffled in place, so a list of every data ordinal is never made.
+        data_ordinals = array('q', data_ordinals)
+        rng.shuffle(data_ordinals)
 
         data_ordinal_count = len(data_ordinals)
         training_ordinal_count = int(args.training_percent * data_ordinal_count)
@@ -1028,6 +1346,7 @@ def define_available_ordinals(original_line_count, args):
         if not args_ok:
             sys.exit(1)
 
+        # Slices of an array are also arrays.
         TrainingSet.available_ordinals = data_ordinals[0:training_ordinal_count]
         ValidationSet.available_ordinals = data_ordinals[training_ordinal_count:]
 
@@ -1035,36 +1354,41 @@ def define_available_ordinals(original_line_count, args):
         # Creating generic sets.
         # Define the full range of row ordinals of the original file as the ones to
         # use by the ValidatonSet class. 2 to skip the header line.
-        ValidationSet.available_ordinals = list(data_ordinals)
+        # No list of every row ordinal is made, except the list of indices
+        # rng.sample makes for a set whose row count is close to the number
+        # of data rows.
+        ValidationSet.available_ordinals = data_ordinals
 
-def create_training_sets(original_column_count, starting_set_number, args,
-                         column_set):
+def create_training_sets(original_column_count, starting_set_number,
+                         last_set_number, args, column_set):
 
     """
-    Create the training set and validation set objects.
+    Create the training set and validation set objects, for set numbers
+    starting_set_number to last_set_number, or as many of them as the system
+    limit on open files allows.
 
     The TrainingSet constructor creates the Validation set for that
     training set.
     """
 
-    print('Creating SelectionSet objects for training and validation sets...', end='')
-
     selection_sets = []
 
     # Create the training sets.
-    ending_set_number = min(starting_set_number - 1 + args.set_count,
-                            args.set_count)
+    ending_set_number = last_set_number
 
     for i in range(starting_set_number, ending_set_number + 1):
         try:
 
             column_set_to_use = column_set
             if args.column_set_start is not None:
-                # Using a column set file.
+                # Using a column set file. Each set uses one more of its
+                # columns than the set before it. A slice of a tuple is a
+                # tuple, so each set's columns can't be changed either.
                 cols = args.column_set_start + (i - 1)
                 column_set_to_use = column_set[0:cols]
 
-            tr_set = TrainingSet(i, original_column_count, args, column_set_to_use)
+            tr_set = TrainingSet(i, original_column_count, args,
+                                 column_set_to_use)
         except OSError as e:
             if e.errno == 24:
                 # A file open error occurred.
@@ -1094,14 +1418,15 @@ def create_training_sets(original_column_count, starting_set_number, args,
 
         selection_sets.append(tr_set)
 
-    print('...Done')
     return selection_sets, ending_set_number
 
-def create_generic_sets(original_column_count, starting_set_number, args,
-                        column_set):
+def create_generic_sets(original_column_count, starting_set_number,
+                        last_set_number, args, column_set):
 
     """
-    Create the generic set objects.
+    Create the generic set objects, for set numbers starting_set_number to
+    last_set_number, or as many of them as the system limit on open files
+    allows.
 
     We use the ValidationSet for this since they have the necessary
     functionality, so new set class is needed. TrainingSet won't work
@@ -1109,8 +1434,6 @@ def create_generic_sets(original_column_count, starting_set_number, args,
     only need one SelectionSet for each generic set.
     """
 
-    print('Creating SelectionSet objects for generic sets...', end='')
-
     if column_set is not None:
         # Generic sets can't use a column set, so one should not have been
         # specified.
@@ -1120,8 +1443,8 @@ def create_generic_sets(original_column_count, starting_set_number, args,
 
     selection_sets = []
 
-    # Create the training sets.
-    ending_set_number = min(starting_set_number - 1 + args.set_count, args.set_count)
+    # Create the generic sets.
+    ending_set_number = last_set_number
 
     for i in range(starting_set_number, ending_set_number + 1):
         try:
@@ -1157,87 +1480,206 @@ def create_generic_sets(original_column_count, starting_set_number, args,
 
         selection_sets.append(val_set)
 
-    print('...Done')
     return selection_sets, ending_set_number
 
-def create_selection_sets(original_column_count, starting_set_number, args,
-                          column_set):
+def create_selection_sets(original_column_count, starting_set_number,
+                          last_set_number, args, column_set):
 
     """
     Create the SelectionSet objects needed for sampling.
+
+    Returns the selection sets, the mapping of row ordinals to the line
+    writers of the selection sets that write them, from get_row_writers, and
+    the number of the last set created.
     """
 
     if args.training_percent is not None:
         # Doing training and validation sets.
         selection_sets, ending_set_number = create_training_sets(
                                                 original_column_count,
-                                                starting_set_number, args,
+                                                starting_set_number,
+                                                last_set_number, args,
                                                 column_set)
     else:
         # Doing generic sets.
         selection_sets, ending_set_number = create_generic_sets(
                                                 original_column_count,
-                                                starting_set_number, args,
+                                                starting_set_number,
+                                                last_set_number, args,
                                                 column_set)
 
-    return selection_sets, ending_set_number
+    # Built once, as soon as the selection sets exist, so processing the
+    # original file needs no per set membership checks.
+    row_writers = get_row_writers(selection_sets)
 
-def process_original_file(input_file, selection_sets, delimiter):
+    return selection_sets, row_writers, ending_set_number
 
+def get_row_writers(selection_sets):
+
+    """
+    Map each row ordinal of the original file to a list of the write_line
+    functions of the selection sets that write that row, including the
+    validation sets owned by training sets.
+
+    This is so each line of the original file is a single dictionary lookup,
+    rather than a membership check against the row ordinals of every
+    selection set. The write_line functions are looked up here, once per set,
+    rather than as an attribute of a set for every line written.
     """
 
-    Process each line from input_file.
+    row_writers = defaultdict(list)
+    for selection_set in selection_sets:
+        for sel_set in selection_set.get_selection_sets():
+            write_line = sel_set.write_line
+            for ordinal in sel_set.row_ordinals:
+                row_writers[ordinal].append(write_line)
 
-    input_file is an open file object.
-        If it is a file being read from a zip file, the lines read will be byte
-        objects, which will need to be converted to string objects.
+    # A plain dictionary, so looking up a row no set writes doesn't add it.
+    return dict(row_writers)
 
-    Each line is passed to each selection set. If the ordinal for that line is
-    one of the row ordinals for a selection set the selection set writes it to
-    its set file (training set file for a training set, validation set file for
-    a validation set.
+def process_original_file(input_file, selection_sets, row_writers, delimiter):
 
     """
 
-    # Count the line ordinals starting from 1, not the default of 0.
-    option_base = 1
-    for (ordinal, line) in enumerate(input_file, option_base):
+    Process each line from input_file.
 
-        # If reading from a zip file, convert from bytes to string.
-        if isinstance(line, bytes):
-            line = line.decode('utf-8')
+    input_file is an open binary file object, for a regular file or a file
+    being read from a zip file, from which the lines read are bytes objects.
+    They are never decoded, since the field values are only copied, not
+    examined. The selection sets write the fields as bytes too.
 
-        # Used for debugging.
-        #if ordinal == 1:
-            #header = line
+    row_writers maps each row ordinal written by any of the selection_sets to
+    the write_line functions of the selection sets that write it, as
+    returned by get_row_writers.
 
-        if line.find(delimiter) == -1:
-            msg = f'The delimiter, "{delimiter}" was not found in line\n {line}'
-            print(msg)
-            sys.exit(1)
+    delimiter is a string. It is encoded to bytes to split the lines with.
 
-        # Delete trailing newline from last column, otherwise, if the last
-        # column is written to a training set then that training set will have
-        # extra blank lines.
-        line_fields = line.rstrip('\n').split(delimiter)
+    Each line is passed to each selection set that has the ordinal for that
+    line as one of its row ordinals, and that selection set writes it to its
+    set file (training set file for a training set, validation set file for a
+    validation set). Lines that are not for any selection set are not
+    examined at all, and no lines after the block containing the last one
+    for any selection set are read.
 
-        #if len(line_fields) != original_column_count:
-            #msg = 'Line {0} has {1} columns, which doesn''t match'
-            #msg += ' the header line, which has {2} columns.'
-            #msg += '\nHeader line:\n{3}'
-            #msg += '\nline {0}:\n{4}'
-            #msg = msg.format(ordinal, len(line_fields), original_column_count, \
-                             #header, line)
-            #print(msg)
-            #sys.exit(0)
+    Only the fields up to the last column written by any selection set are
+    split from a line. The rest of the line is left as one field, which is
+    not written, so for a wide original file most of the fields of a line
+    are often never made into separate bytes objects. Selection sets that
+    write all the columns of the original file, in order, write the line
+    itself, so if every selection set does, no line is split at all.
 
-        for sel_set in selection_sets:
-            sel_set.check_line(ordinal, line_fields)
+    """
+
+    # pylint: disable=too-many-locals
+
+    # The ordinals of the lines written by any selection set, in ascending
+    # order.
+    wanted_ordinals = sorted(row_writers)
+    wanted_count = len(wanted_ordinals)
+
+    # Selection sets that write the whole line don't need it split into
+    # fields. If none of the selection sets need the fields, no line is split.
+    field_column_indices = [sel_set.last_column_index
+                            for selection_set in selection_sets
+                            for sel_set in selection_set.get_selection_sets()
+                            if not sel_set.writes_whole_line]
+    split_count = None
+    if field_column_indices:
+        split_count = 1 + max(field_column_indices)
+
+    delimiter_bytes = delimiter.encode('utf_8')
+
+    # The original file is read a block of lines at a time, with readlines,
+    # rather than a line at a time in a Python loop. The wanted ordinals
+    # within the block are found with a binary search, and just those lines
+    # are taken from the block by index. The other lines of the block are
+    # never touched by Python code.
+    #
+    # The file is not memory mapped, since readlines already finds the line
+    # ends in C.
+    #
+    # There is no separate path for copying a set's lines as a byte range,
+    # ex. with os.sendfile. Rows are sampled, so a set's lines are only
+    # consecutive if it has every data row, and the lines are already read.
+    #
+    # The ordinal of the first line of the block. Line ordinals start at 1.
+    block_ordinal = 1
+    # The index in wanted_ordinals of the first ordinal not yet written.
+    wanted_index = 0
+    while wanted_index < wanted_count:
+
+        lines = input_file.readlines(READ_BUFFER_SIZE)
+        if not lines:
+            break
+
+        if block_ordinal == 1:
+            # Only the header line is checked for the delimiter. All lines
+            # are assumed to have the same columns as the header line, so
+            # searching every line written for the delimiter as well would
+            # be a second scan of each line, before the split.
+            header = lines[0]
+            if header.find(delimiter_bytes) == -1:
+                header = header.decode('utf_8', errors='replace')
+                msg = f'The delimiter, "{delimiter}" was not found in the'
+                msg += f' header line\n {header}'
+                print(msg)
+                sys.exit(1)
+
+        next_block_ordinal = block_ordinal + len(lines)
+        block_wanted_end = bisect.bisect_left(wanted_ordinals,
+                                              next_block_ordinal,
+                                              wanted_index)
+
+        # This loop is not compiled with Numba or Cython, which are not
+        # dependencies of this script.
+        for ordinal in wanted_ordinals[wanted_index:block_wanted_end]:
+
+            # Delete trailing newline from last column, otherwise, if the last
+            # column is written to a training set then that training set will
+            # have extra blank lines. The file is read in binary, so a carriage
+            # return before the newline is not removed by the file object and
+            # is deleted here too. rstrip is used rather than slicing off the
+            # last byte, since it also handles a carriage return and a last
+            # line with no newline.
+            line = lines[ordinal - block_ordinal].rstrip(b'\r\n')
+
+            line_fields = None
+            if split_count is not None:
+                line_fields = line.split(delimiter_bytes, split_count)
+
+            #if len(line_fields) != original_column_count:
+                #msg = 'Line {0} has {1} columns, which doesn''t match'
+                #msg += ' the header line, which has {2} columns.'
+                #msg += '\nHeader line:\n{3}'
+                #msg += '\nline {0}:\n{4}'
+                #msg = msg.format(ordinal, len(line_fields), original_column_count, \
+                                 #header, line)
+                #print(msg)
+                #sys.exit(0)
+
+            try:
+                for write_line in row_writers[ordinal]:
+                    write_line(ordinal, line, line_fields)
+            except IndexError:
+                # The line has fewer fields than a selection set writes, ex.
+                # a blank line.
+                line = line.decode('utf_8', errors='replace')
+                if line.find(delimiter) == -1:
+                    msg = f'The delimiter, "{delimiter}" was not found in line'
+                    msg += f' {ordinal}\n {line}'
+                else:
+                    msg = f'Line {ordinal} has fewer columns than the header'
+                    msg += f' line\n {line}'
+                print(msg)
+                sys.exit(1)
+
+        wanted_index = block_wanted_end
+        block_ordinal = next_block_ordinal
 
 @contextmanager
 def get_original_file_object(original_file_name):
     """
-    Get and return a file object to the original data file,
+    Get and return a binary file object to the original data file,
     even if it is in a zip file.
 
     This function is decorated as a contextmanager, so it can be used in
@@ -1254,7 +1696,8 @@ def get_original_file_object(original_file_name):
             regular_file.close()
             zip_file.close()
     else:
-        regular_file = open(original_file_name, 'r', encoding='utf_8')
+        regular_file = open(original_file_name, 'rb',
+                            buffering=READ_BUFFER_SIZE)
         try:
             yield regular_file
         finally:
@@ -1295,7 +1738,7 @@ def get_original_from_zip(zip_file_name):
 
     try:
         # pylint: disable=consider-using-with
-        regular_file = zfile.open(regular_file_name)
+        zip_member = zfile.open(regular_file_name)
     except IOError as e:
         msg = '\nThe following exception occured opening'
         msg += ' zip file member {} from zip file {}\n{}'
@@ -1303,6 +1746,11 @@ def get_original_from_zip(zip_file_name):
         print(msg)
         sys.exit(1)
 
+    # The member is decompressed as it is read. A large buffer means it is
+    # read and decompressed in large blocks rather than many small ones.
+    regular_file = io.BufferedReader(zip_member,
+                                     buffer_size=READ_BUFFER_SIZE)
+
     return zfile, regular_file
 
 def close_selection_sets(selection_sets):
@@ -1314,7 +1762,326 @@ def close_selection_sets(selection_sets):
     for selset in selection_sets:
         selset.close()
 
-# pylint: disable=too-many-locals
+def create_set_range(set_numbers, original_column_count, args, column_set,
+                     in_worker=False):
+
+    """
+    Create the sets with the numbers in set_numbers, a range.
+
+    The original file is processed using as many passes as necessary, given
+    the system limit on the maximum number of open files.
+
+    The progress of each pass is printed as it goes. If in_worker is True,
+    other worker processes are printing at the same time, so just one
+    complete line is printed for each pass, starting with set_numbers.
+
+    Returns the number of passes of the original file.
+    """
+
+    # pylint: disable=too-many-locals
+
+    last_set_number = set_numbers[-1]
+    starting_set_number = set_numbers[0]
+    ending_set_number = starting_set_number - 1
+    file_pass_count = 0
+    while ending_set_number < last_set_number:
+
+        tic = time.perf_counter()
+        file_pass_count += 1
+        if not in_worker:
+            print(f'\nPerforming pass {file_pass_count} of {args.original_file_name}')
+
+        # Get a file object to the original file, open for reading.
+        # This must come before creating the selection sets to avoid a
+        # "too many open files" error. If the creation of the selection sets
+        # uses up the available open files, then attempting to open the
+        # original file would cauase a "too many open files" error. Opening
+        # the original file first accounts for that open file, then we can
+        # open as many selection sets as allowed from the remaining open file
+        # slots.
+        with get_original_file_object(args.original_file_name) as input_file:
+
+            if not in_worker:
+                set_types = 'generic'
+                if args.training_percent is not None:
+                    set_types = 'training and validation'
+                msg = 'Creating SelectionSet objects for {} sets...'
+                print(msg.format(set_types), end='')
+
+            # Create as many SelectionSet objects as allowed by the
+            # system limit on number of open files.
+            (selection_sets, row_writers,
+             ending_set_number) = create_selection_sets(
+                                                      original_column_count,
+                                                      starting_set_number,
+                                                      last_set_number, args,
+                                                      column_set)
+
+            if not in_worker:
+                print('...Done')
+                msg = 'Creating SelectionSet files {} to {} ...'
+                print(msg.format(starting_set_number, ending_set_number),
+                      end='')
+
+            process_original_file(input_file, selection_sets, row_writers,
+                                  args.delimiter)
+
+        close_selection_sets(selection_sets)
+        if not in_worker:
+            print('...Done')
+
+        # For generic sets this is the total number of sets in the pass.
+        # For training/validation sets it is the number of training sets,
+        # not the number of training sets + number of validation sets.
+        pass_set_count = ending_set_number - starting_set_number + 1
+
+        toc = time.perf_counter()
+        pass_time = toc - tic
+        set_time = pass_time / pass_set_count
+        if in_worker:
+            msg = f'Sets {set_numbers[0]} to {last_set_number}: pass'
+            msg += f' {file_pass_count} created sets {starting_set_number} to'
+            msg += f' {ending_set_number} in {pass_time:.0f} seconds,'
+            msg += f' {set_time:.0f} seconds per set.'
+            # Written in one call, with its newline, and flushed, so it isn't
+            # split by a line from another worker. print writes the newline
+            # separately.
+            sys.stdout.write(msg + '\n')
+            sys.stdout.flush()
+        else:
+            msg = f'Pass {file_pass_count} took {pass_time:.0f} seconds,'
+            msg += f' {set_time:.0f} seconds per set for {pass_set_count} sets.'
+            print(msg)
+
+        starting_set_number = ending_set_number + 1
+
+    return file_pass_count
+
+@contextmanager
+def shared_available_ordinals():
+
+    """
+    Copy the TrainingSet and ValidationSet available_ordinals to shared
+    memory, so each worker process reads the same copy rather than being
+    sent its own pickled copy.
+
+    Yields a tuple of a description of each of them, for
+    attach_available_ordinals in a worker process. For an array, this is the
+    name of its shared memory block and the number of ordinals in it.
+    Otherwise, None or a range for generic sets, it is the value itself,
+    which is small to send as is. If shared memory isn't available, before
+    Python 3.8, an array is also the value itself, pickled for each worker
+    process.
+
+    The shared memory blocks are removed on exit.
+
+    This function is decorated as a contextmanager, so it can be used in
+    a with statement:
+    with shared_available_ordinals() as available_ordinals:
+        start worker processes with available_ordinals
+    """
+
+    shared_blocks = []
+    descriptions = []
+    try:
+        for ordinals in (TrainingSet.available_ordinals,
+                         ValidationSet.available_ordinals):
+
+            if shared_memory is None or not isinstance(ordinals, array):
+                descriptions.append(ordinals)
+                continue
+
+            byte_count = len(ordinals) * ordinals.itemsize
+            # A shared memory block can't be 0 bytes.
+            block = shared_memory.SharedMemory(create=True,
+                                               size=max(byte_count, 1))
+            shared_blocks.append(block)
+            block.buf[:byte_count] = memoryview(ordinals).cast('B')
+            descriptions.append((block.name, len(ordinals)))
+
+        yield tuple(descriptions)
+    finally:
+        for block in shared_blocks:
+            block.close()
+            block.unlink()
+
+def attach_available_ordinals(description, shared_blocks):
+
+    """
+    Get available ordinals described by shared_available_ordinals, in a
+    worker process.
+
+    For ordinals in shared memory, this is a memoryview of 8 byte integers
+    of the shared memory block, which is a sequence like the original array,
+    without a copy.
+
+    The block is appended to the list shared_blocks, to be closed when the
+    worker is done with it, once the memoryview has been released.
+    """
+
+    if not isinstance(description, tuple):
+        return description
+
+    (name, count) = description
+    block = shared_memory.SharedMemory(name=name)
+    shared_blocks.append(block)
+
+    return block.buf.cast('q')[:count]
+
+def create_set_range_in_process(set_numbers, original_column_count, args,
+                                column_set, available_ordinals):
+
+    """
+    Create the sets with the numbers in set_numbers, a range, in a worker
+    process.
+
+    available_ordinals is a tuple of the descriptions of the TrainingSet and
+    ValidationSet available_ordinals, from shared_available_ordinals, since a
+    worker process doesn't necessarily inherit them from the main process.
+
+    Returns the number of passes of the original file, and the ordinals
+    collected for the sets if args.ordinals_file_name was specified, or None.
+    """
+
+    shared_blocks = []
+    (training_ordinals, validation_ordinals) = (
+        attach_available_ordinals(description, shared_blocks)
+        for description in available_ordinals)
+
+    TrainingSet.available_ordinals = training_ordinals
+    ValidationSet.available_ordinals = validation_ordinals
+
+    SelectionSet.write_buffer_size = args.write_buffer_size * 1024
+
+    if args.ordinals_file_name is not None:
+        SelectionSet.ordinals_collection = {}
+
+    try:
+        file_pass_count = create_set_range(set_numbers, original_column_count,
+                                           args, column_set, in_worker=True)
+    finally:
+        # A shared memory block can't be closed while a memoryview of it
+        # exists.
+        TrainingSet.available_ordinals = None
+        ValidationSet.available_ordinals = None
+        for ordinals in (training_ordinals, validation_ordinals):
+            if isinstance(ordinals, memoryview):
+                ordinals.release()
+        for block in shared_blocks:
+            block.close()
+
+    return file_pass_count, SelectionSet.ordinals_collection
+
+def create_set_ranges_in_parallel(original_column_count, args, column_set):
+
+    """
+    Divide the set numbers into args.jobs consecutive ranges and create the
+    sets in each range in a separate process, each making its own passes of
+    the original file.
+
+    Creating each set is independent of creating any other set, except for
+    sharing the available row ordinals, which are defined before this is
+    called. They are shared through shared memory rather than copied to
+    each process.
+
+    Each set has its own random number generator, seeded from args.seed and
+    its set number, so the sets are the same for any number of jobs.
+
+    Any ordinals collected by the processes are added to the main process's
+    SelectionSet.ordinals_collection.
+
+    Returns the total number of passes of the original file.
+    """
+
+    job_count = min(args.jobs, args.set_count)
+
+    with shared_available_ordinals() as available_ordinals, \
+         ProcessPoolExecutor(max_workers=job_count) as executor:
+        futures = []
+        for job in range(job_count):
+            first_set_number = 1 + job * args.set_count // job_count
+            last_set_number = (job + 1) * args.set_count // job_count
+            set_numbers = range(first_set_number, last_set_number + 1)
+            futures.append(executor.submit(create_set_range_in_process,
+                                           set_numbers, original_column_count,
+                                           args, column_set,
+                                           available_ordinals))
+
+        file_pass_count = 0
+        for future in futures:
+            (job_pass_count, ordinals_collection) = future.result()
+            file_pass_count += job_pass_count
+            if ordinals_collection is not None:
+                SelectionSet.ordinals_collection.update(ordinals_collection)
+
+    return file_pass_count
+
+def write_ordinals_file(ordinals_file_name):
+
+    """
+    Write the ordinals collected for all sets to a single Python Pickle file.
+
+    It contains a dictionary keyed by the name of the ordinal file that
+    would otherwise have been written, ex. "training-set-1-row-ordinals" or
+    "validation-set-1-column-ordinals". Each value is an array of 8 byte
+    integers, from the array module, of the ordinals in ascending order.
+    """
+
+    # Protocol 4 can be read by Python 3.4 and later, so the file can be used
+    # by an older Python than the one writing it.
+    with open(ordinals_file_name, 'wb') as ordinals_file:
+        pickle.dump(SelectionSet.ordinals_collection, ordinals_file,
+                    protocol=4)
+
+def load_original_file_info(original_data_file_info):
+
+    """
+    Load the original file info from the Python Pickle file written by
+    get_original_file_info.py.
+
+    Returns a tuple of the number of lines and the number of columns of the
+    original file.
+    """
+
+    with open(original_data_file_info, 'rb') as odi_file:
+        (original_line_count, original_column_count) = pickle.load(odi_file)
+
+    return original_line_count, original_column_count
+
+def raise_open_file_limit():
+
+    """
+    Raise the soft limit on the number of open files to the hard limit, which
+    doesn't require any privileges.
+
+    Each pass of the original file creates as many sets as there are open
+    files available, so with a higher limit fewer passes are needed. The
+    soft limit is often 1024 on Linux systems, while the hard limit is much
+    higher.
+
+    If the limit can't be raised, ex. if the resource module isn't available
+    on this system, it is left as it is.
+    """
+
+    if resource is None:
+        return
+
+    (soft_limit, hard_limit) = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit == hard_limit:
+        return
+
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard_limit, hard_limit))
+    except (ValueError, OSError) as e:
+        # Ex. on macOS the soft limit can't be raised to an unlimited hard
+        # limit.
+        msg = 'The open file limit of {} could not be raised to {}: {}'
+        print(msg.format(soft_limit, hard_limit, e))
+        return
+
+    msg = 'Raised the open file limit from {} to {}.'
+    print(msg.format(soft_limit, hard_limit))
+
 def program_start():
     """
     The main function for the program.
@@ -1331,20 +2098,25 @@ def program_start():
     args = define_and_check_args()
     #print_args(args)
 
-    # Load the original file info.
-    with open(args.original_data_file_info, 'rb') as odi_file:
-        (original_line_count, original_column_count) = pickle.load(odi_file)
+    # For as few passes of the original file as possible.
+    raise_open_file_limit()
+
+    (original_line_count,
+     original_column_count) = load_original_file_info(
+                                   args.original_data_file_info)
 
     check_args_additional(original_column_count, args)
 
     # If requested get a restricted set of column ordinals to use.
     column_set = None
     if args.column_set_file_name is not None:
-        column_set = get_column_set(original_column_count, args)
+        # A tuple, since it is only read. Each training set takes a slice of
+        # it.
+        column_set = tuple(get_column_set(original_column_count, args))
 
         column_set_count = len(column_set)
         if column_set_count < args.column_count:
-            msg += 'The number of columns, {}, from the column set file'
+            msg = 'The number of columns, {}, from the column set file'
             msg += ' {} is less than the specified column count of {}.'
             msg = msg.format(column_set_count, args.column_set_file_name,
                              args.column_count)
@@ -1361,58 +2133,35 @@ def program_start():
             print(msg)
             sys.exit(1)
 
-    # Define a partition the original file into two disjoint sets of row
-    # ordinals, one for training sets and one for validation sets.
-    define_available_ordinals(original_line_count, args)
-
-    # Process the original file using as many passes as necessary,
-    # given the system limit on the macimum number of open files.
-    starting_set_number = 1
-    ending_set_number = 0
-    file_pass_count = 0
-    while ending_set_number < args.set_count:
+    if args.seed is None:
+        # Printed, so the same sets can be created again.
+        args.seed = random.SystemRandom().getrandbits(64)
+        print(f'Using random seed {args.seed}')
 
-        tic = time.perf_counter()
-        file_pass_count += 1
-        print(f'\nPerforming pass {file_pass_count} of {args.original_file_name}')
+    # The random number generator for dividing the rows of the original file.
+    # Each set has its own, from SelectionSet.get_set_rng.
+    rng = random.Random(args.seed)
 
-        # Get a file object to the original file, open for reading.
-        # This must come before creating the selection sets to avoid a
-        # "too many open files" error. If the creation of the selection sets
-        # uses up the available open files, then attempting to open the
-        # original file would cauase a "too many open files" error. Opening
-        # the original file first accounts for that open file, then we can
-        # open as many selection sets as allowed from the remaining open file
-        # slots.
-        with get_original_file_object(args.original_file_name) as input_file:
-
-            # Create as many SelectionSet objects as allowed by the
-            # system limit on number of open files.
-            (selection_sets, ending_set_number) = create_selection_sets(
-                                                      original_column_count,
-                                                      starting_set_number, args,
-                                                      column_set)
-
-            msg = 'Creating SelectionSet files {} to {} ...'
-            print(msg.format(starting_set_number, ending_set_number), end='')
-            process_original_file(input_file, selection_sets, args.delimiter)
+    # Define a partition the original file into two disjoint sets of row
+    # ordinals, one for training sets and one for validation sets.
+    define_available_ordinals(original_line_count, args, rng)
 
-        close_selection_sets(selection_sets)
-        print('...Done')
+    SelectionSet.write_buffer_size = args.write_buffer_size * 1024
 
-        # For generic sets this is the total number of sets in the pass.
-        # For training/validation sets it is the number of training sets,
-        # not the number of training sets + number of validation sets.
-        pass_set_count = ending_set_number - starting_set_number + 1
+    if args.ordinals_file_name is not None:
+        # Collect the ordinals for all sets, to write to one file at the end.
+        SelectionSet.ordinals_collection = {}
 
-        toc = time.perf_counter()
-        pass_time = toc - tic
-        set_time = pass_time / pass_set_count
-        msg = f'Pass {file_pass_count} took {pass_time:.0f} seconds,'
-        msg += f' {set_time:.0f} seconds per set for {pass_set_count} sets.'
-        print(msg)
+    if args.jobs == 1:
+        file_pass_count = create_set_range(range(1, args.set_count + 1),
+                                           original_column_count, args,
+                                           column_set)
+    else:
+        file_pass_count = create_set_ranges_in_parallel(original_column_count,
+                                                        args, column_set)
 
-        starting_set_number = ending_set_number + 1
+    if args.ordinals_file_name is not None:
+        write_ordinals_file(args.ordinals_file_name)
 
     total_toc = time.perf_counter()
     print(f'\n{file_pass_count} passes completed in {total_toc - total_tic:.0f} seconds')
@@ -241,9 +241,10 @@ def program_start():
     # Create a single data structure for writing to the Pickle file.
     save_info = (original_line_count, original_column_count)
 
-    # Write the Pickle file.
+    # Write the Pickle file. Protocol 4 can be read by Python 3.4 and later,
+    # so the file can be used by an older Python than the one writing it.
     with open(args.output_file_name, 'wb') as output_file:
-        pickle.dump(save_info, output_file)
+        pickle.dump(save_info, output_file, protocol=4)
 
     print(f'original_line_count {original_line_count}')
     print(f'original_column_count {original_column_count}')